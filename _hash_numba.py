@@ -0,0 +1,105 @@
+"""
+Numba-compiled xxHash64 for SmartHash
+Used instead of hashlib SHA-256 on machines where OpenSSL lacks SHA-NI.
+Requires numpy and numba; import failures are handled by the caller.
+"""
+
+import numpy as np
+from numba import njit
+
+PRIME64_1 = np.uint64(0x9E3779B185EBCA87)
+PRIME64_2 = np.uint64(0xC2B2AE3D27D4EB4F)
+PRIME64_3 = np.uint64(0x165667B19E3779F9)
+PRIME64_4 = np.uint64(0x85EBCA77C2B2AE63)
+PRIME64_5 = np.uint64(0x27D4EB2F165667C5)
+
+
+@njit(cache=True, inline='always')
+def _rotl(x, r):
+    # Shift counts must stay uint64, mixing with int64 promotes to float
+    return (x << np.uint64(r)) | (x >> np.uint64(64 - r))
+
+
+@njit(cache=True, inline='always')
+def _round(acc, lane):
+    acc += lane * PRIME64_2
+    acc = _rotl(acc, 31)
+    return acc * PRIME64_1
+
+
+@njit(cache=True, inline='always')
+def _merge(acc, val):
+    acc ^= _round(np.uint64(0), val)
+    return acc * PRIME64_1 + PRIME64_4
+
+
+@njit(cache=True, inline='always')
+def _read64(arr, i):
+    value = np.uint64(0)
+    for k in range(8):
+        value |= np.uint64(arr[i + k]) << np.uint64(8 * k)
+    return value
+
+
+@njit(cache=True, inline='always')
+def _read32(arr, i):
+    value = np.uint64(0)
+    for k in range(4):
+        value |= np.uint64(arr[i + k]) << np.uint64(8 * k)
+    return value
+
+
+@njit(cache=True, fastmath=True)
+def xxh64_block(arr, seed):
+    """Compute the xxHash64 of a uint8 array"""
+    seed = np.uint64(seed)
+    n = arr.size
+    p = 0
+
+    if n >= 32:
+        v1 = seed + PRIME64_1 + PRIME64_2
+        v2 = seed + PRIME64_2
+        v3 = seed
+        v4 = seed - PRIME64_1
+
+        # Process 32-byte stripes across four independent accumulators
+        while p + 32 <= n:
+            v1 = _round(v1, _read64(arr, p))
+            v2 = _round(v2, _read64(arr, p + 8))
+            v3 = _round(v3, _read64(arr, p + 16))
+            v4 = _round(v4, _read64(arr, p + 24))
+            p += 32
+
+        h = _rotl(v1, 1) + _rotl(v2, 7) + _rotl(v3, 12) + _rotl(v4, 18)
+        h = _merge(h, v1)
+        h = _merge(h, v2)
+        h = _merge(h, v3)
+        h = _merge(h, v4)
+    else:
+        h = seed + PRIME64_5
+
+    h += np.uint64(n)
+
+    # Remaining 8-byte lanes, one 4-byte lane, then single bytes
+    while p + 8 <= n:
+        h ^= _round(np.uint64(0), _read64(arr, p))
+        h = _rotl(h, 27) * PRIME64_1 + PRIME64_4
+        p += 8
+
+    if p + 4 <= n:
+        h ^= _read32(arr, p) * PRIME64_1
+        h = _rotl(h, 23) * PRIME64_2 + PRIME64_3
+        p += 4
+
+    while p < n:
+        h ^= np.uint64(arr[p]) * PRIME64_5
+        h = _rotl(h, 11) * PRIME64_1
+        p += 1
+
+    # Final avalanche
+    h ^= h >> np.uint64(33)
+    h *= PRIME64_2
+    h ^= h >> np.uint64(29)
+    h *= PRIME64_3
+    h ^= h >> np.uint64(32)
+    return h
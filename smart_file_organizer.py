@@ -6,18 +6,27 @@ A production-grade file organization system using AI to analyze, tag, and organi
 
 import os
 import sys
+import copy
 import json
+import queue
 import hashlib
+import mmap
 import sqlite3
 import argparse
+import itertools
+import multiprocessing
 import mimetypes
 import threading
 import time
 import re
+import shutil
+import struct
+import subprocess
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass, field, asdict
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union, Any
+from dataclasses import dataclass, field, asdict, replace
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
 
 # Third-party imports
@@ -43,6 +52,18 @@ try:
 except ImportError:
     PyPDF2 = None
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np
+    from _hash_numba import xxh64_block
+except ImportError:
+    np = None
+    xxh64_block = None
+
 # Configuration loading
 try:
     import tomllib
@@ -53,6 +74,22 @@ except ImportError:
         tomllib = None
 
 
+def _json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes (orjson when available), compact unless indent is set"""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _json_loads(data: bytes) -> Any:
+    """Deserialize JSON bytes (orjson when available)"""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 @dataclass
 class Config:
     """Configuration for Smart File Organizer AI"""
@@ -123,63 +160,272 @@ def load_config() -> Config:
     return config
 
 
+class TokenBucket:
+    """Thread-safe token bucket for rate limiting AI backend calls"""
+    
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last = time.monotonic()
+        self._cond = threading.Condition()
+    
+    def acquire(self):
+        """Block until a token is available, then consume it"""
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                
+                self._cond.wait((1 - self._tokens) / self.rate)
+
+
 class SmartHash:
     """Intelligent file hashing for efficient caching"""
     
+    # Truncated SHA-256 digest length used as the cache key
+    DIGEST_SIZE = 16
+    
+    # hashlib SHA-256 slower than this (bytes/s) is assumed to lack SHA-NI
+    SHA256_FAST_THRESHOLD = 800 * 1024 * 1024
+    
+    _backend: Optional[str] = None
+    
+    @classmethod
+    def backend(cls) -> str:
+        """Return the head/tail hash backend; SHA-256 unless a cache pinned another"""
+        if cls._backend is None:
+            cls._backend = "sha256"
+        return cls._backend
+    
+    @classmethod
+    def use_backend(cls, backend: str):
+        """Pin the backend, e.g. so hash pool workers match the parent process"""
+        cls._backend = backend
+    
+    @classmethod
+    def detect_backend(cls) -> str:
+        """
+        Benchmark hashlib SHA-256 and pick xxh64 if it isn't hardware-accelerated
+        Only run when a new cache records its backend, since the choice is part of every key.
+        """
+        if xxh64_block is None:
+            return "sha256"
+        
+        sample = bytes(1 << 20)
+        hashlib.sha256(sample).digest()
+        # Best of several rounds, so a briefly busy machine doesn't look slow
+        best = float('inf')
+        for _ in range(5):
+            start = time.perf_counter()
+            hashlib.sha256(sample).digest()
+            best = min(best, time.perf_counter() - start)
+        throughput = len(sample) / max(best, 1e-9)
+        
+        if throughput >= cls.SHA256_FAST_THRESHOLD:
+            return "sha256"
+        # Borderline results are ambiguous; let the CPU flags break the tie
+        if throughput >= cls.SHA256_FAST_THRESHOLD / 2 and cls._cpu_has_sha_extensions():
+            return "sha256"
+        return "xxh64"
+    
     @staticmethod
-    def calculate(file_path: Path, chunk_size: int = 65536) -> str:
+    def _cpu_has_sha_extensions() -> Optional[bool]:
+        """Report x86 SHA-NI / ARMv8 sha2 support from /proc/cpuinfo; None if unknown"""
+        try:
+            with open('/proc/cpuinfo') as f:
+                cpuinfo = f.read()
+        except OSError:
+            return None
+        
+        flags = set()
+        for line in cpuinfo.splitlines():
+            key, _, value = line.partition(':')
+            if key.strip().lower() in ('flags', 'features'):
+                flags.update(value.split())
+        if not flags:
+            return None
+        return 'sha_ni' in flags or 'sha2' in flags
+    
+    @staticmethod
+    def _xxh64_digest(buf, file_size: int, chunk_size: int) -> bytes:
+        """xxHash64 the head/tail windows of a mapped (or read) file"""
+        arr = np.frombuffer(buf, dtype=np.uint8)
+        try:
+            head = int(xxh64_block(arr[:chunk_size], 0))
+            tail = int(xxh64_block(arr[-chunk_size:], 1)) if file_size > chunk_size * 2 else 0
+        finally:
+            # Release the buffer export so the mmap can be closed
+            del arr
+        return struct.pack('<QQ', head, tail)
+    
+    @staticmethod
+    def _hash_windows(hasher, buf, file_size: int, chunk_size: int, use_xxh64: bool):
+        """Feed the head/tail windows of buf (the file, or just its head + tail) to hasher"""
+        if use_xxh64:
+            hasher.update(SmartHash._xxh64_digest(buf, file_size, chunk_size))
+            return
+        
+        with memoryview(buf) as view:
+            # Hash first 64KB
+            hasher.update(view[:chunk_size])
+            
+            # Hash last 64KB if file is large enough
+            if file_size > chunk_size * 2:
+                hasher.update(view[-chunk_size:])
+    
+    @staticmethod
+    def calculate(file_path: Path, chunk_size: int = 65536,
+                  cache: Optional['AnalysisCache'] = None) -> bytes:
         """
         Calculate smart hash: metadata + head (64KB) + tail (64KB)
-        This is faster than hashing entire large files
+        This is faster than hashing entire large files.
+        Returns a 16-byte digest; use .hex() for display.
+        With a cache, files whose stat is unchanged reuse their previous hash without any reads.
         """
+        stat = file_path.stat()
+        if cache:
+            file_hash = cache.get_hash_by_stat(file_path, stat)
+            if file_hash:
+                return file_hash
+        
+        file_hash = SmartHash.digest(file_path, stat, chunk_size)
+        if cache:
+            cache.remember_hash(file_path, stat, file_hash)
+        return file_hash
+    
+    @staticmethod
+    def digest(file_path: Path, stat: os.stat_result, chunk_size: int = 65536) -> bytes:
+        """Hash metadata + head/tail of a file whose stat was already taken"""
         hasher = hashlib.sha256()
+        use_xxh64 = SmartHash.backend() == "xxh64"
+        if use_xxh64:
+            # Tag xxh64-derived keys so they never collide with SHA-256 keys
+            hasher.update(b"xxh64|")
         
         # Hash file metadata
-        stat = file_path.stat()
         metadata = f"{file_path.name}|{stat.st_size}|{stat.st_mtime}"
         hasher.update(metadata.encode())
         
         # Hash head and tail of file
         file_size = stat.st_size
+        if file_size == 0:
+            return hasher.digest()[:SmartHash.DIGEST_SIZE]
         
         with open(file_path, 'rb') as f:
-            # Hash first 64KB
-            head = f.read(chunk_size)
-            hasher.update(head)
-            
-            # Hash last 64KB if file is large enough
-            if file_size > chunk_size * 2:
-                f.seek(-chunk_size, 2)
-                tail = f.read(chunk_size)
-                hasher.update(tail)
+            try:
+                # Map the file once and hash zero-copy views of the head/tail windows
+                mm = mmap.mmap(f.fileno(), length=0, access=mmap.ACCESS_READ)
+            except (ValueError, OverflowError, OSError):
+                # Not mappable (some FUSE/network mounts, special files, >2 GiB on 32-bit builds):
+                # read only the windows; head + tail slices to the same bytes, so the digest matches
+                data = f.read(chunk_size)
+                if file_size > chunk_size * 2:
+                    f.seek(-chunk_size, os.SEEK_END)
+                    data += f.read(chunk_size)
+                SmartHash._hash_windows(hasher, data, file_size, chunk_size, use_xxh64)
+            else:
+                with mm:
+                    SmartHash._hash_windows(hasher, mm, file_size, chunk_size, use_xxh64)
         
-        return hasher.hexdigest()
+        return hasher.digest()[:SmartHash.DIGEST_SIZE]
+
+
+def _hash_path(item: Tuple[Path, os.stat_result]) -> Optional[bytes]:
+    """Process-pool entry point for SmartHash; errors are left for process_file to report"""
+    # Only the hash runs here: MIME detection is a memoized dict lookup on the analyzer, and
+    # previews are only needed for cache misses, so shipping them back would mostly be wasted IPC
+    try:
+        return SmartHash.digest(*item)
+    except Exception:
+        return None
+
+
+class HashPool:
+    """Lazily created process pool for CPU-bound hashing, shareable between organizers"""
+
+    def __init__(self):
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> ProcessPoolExecutor:
+        """Return the pool, creating it on first use"""
+        with self._lock:
+            if self._pool is None:
+                # spawn, not fork: the pool is created while pipeline (and web server) threads run
+                self._pool = ProcessPoolExecutor(
+                    max_workers=os.cpu_count(),
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=SmartHash.use_backend,
+                    initargs=(SmartHash.backend(),)
+                )
+            return self._pool
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker processes; the next get() starts a fresh pool"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool:
+            pool.shutdown(wait=wait)
 
 
 class AnalysisCache:
     """Thread-safe SQLite cache for AI analysis results"""
     
+    # Bump when the analysis_cache schema changes
+    SCHEMA_VERSION = 2
+    
+    # Stays under SQLite's default 999 bound parameters (one is the model)
+    MAX_QUERY_HASHES = 998
+    
+    # Rows deleted per transaction during cleanup
+    CLEANUP_BATCH_SIZE = 10000
+    
+    # Buffered writes are flushed in one transaction once this many pile up
+    WRITE_BATCH_SIZE = 64
+    
+    # Connection-scoped tuning; journal_mode is persisted in the db file itself
+    CONNECTION_PRAGMAS = (
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA cache_size=-16384",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA mmap_size=268435456",
+    )
+    
     def __init__(self, cache_path: str, ttl_days: int = 30):
         self.cache_path = Path(cache_path).expanduser()
         self.cache_path.parent.mkdir(parents=True, exist_ok=True)
         self.ttl_days = ttl_days
-        self._local = threading.local()
+        self._conn = sqlite3.connect(str(self.cache_path), check_same_thread=False, isolation_level=None)
+        for pragma in self.CONNECTION_PRAGMAS:
+            self._conn.execute(pragma)
+        self._write_lock = threading.Lock()
+        self._pending: Dict[Tuple[bytes, str], Tuple[bytes, float]] = {}
+        self._pending_stats: Dict[Tuple[int, int], Tuple] = {}
+        self._pending_lock = threading.Lock()
         self._init_db()
     
-    def _get_connection(self) -> sqlite3.Connection:
-        """Get thread-local database connection"""
-        if not hasattr(self._local, 'conn'):
-            self._local.conn = sqlite3.connect(str(self.cache_path), check_same_thread=False)
-        return self._local.conn
-    
     def _init_db(self):
         """Initialize database schema"""
-        conn = self._get_connection()
+        conn = self._conn
+        conn.execute("PRAGMA journal_mode=WAL")
+        
+        # Older caches keyed on hex TEXT hashes can't be reused; start fresh
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < self.SCHEMA_VERSION:
+            conn.execute("DROP TABLE IF EXISTS analysis_cache")
+            conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        
         conn.execute("""
             CREATE TABLE IF NOT EXISTS analysis_cache (
-                file_hash TEXT,
+                file_hash BLOB,
                 model TEXT,
-                analysis TEXT,
+                analysis BLOB,
                 timestamp REAL,
                 PRIMARY KEY (file_hash, model)
             )
@@ -187,48 +433,217 @@ class AnalysisCache:
         conn.execute("""
             CREATE INDEX IF NOT EXISTS idx_timestamp ON analysis_cache(timestamp)
         """)
-        conn.commit()
+        # Shortcut table: unchanged files reuse their hash without being read
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS file_stat (
+                dev INTEGER,
+                inode INTEGER,
+                name TEXT,
+                size INTEGER,
+                mtime REAL,
+                backend TEXT,
+                file_hash BLOB,
+                PRIMARY KEY (dev, inode)
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS settings (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        """)
+        self._load_hash_backend()
+    
+    def _load_hash_backend(self):
+        """Pin SmartHash to the backend this cache was built with, choosing it on first use"""
+        row = self._conn.execute("SELECT value FROM settings WHERE key = 'hash_backend'").fetchone()
+        if row and (row[0] == "sha256" or xxh64_block is not None):
+            SmartHash.use_backend(row[0])
+            return
+        
+        # New cache, or xxh64 keys with numba no longer installed: benchmark once and record it
+        backend = SmartHash.detect_backend()
+        SmartHash.use_backend(backend)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO settings (key, value) VALUES ('hash_backend', ?)",
+            (backend,)
+        )
     
-    def get(self, file_hash: str, model: str) -> Optional[Dict]:
+    def get(self, file_hash: bytes, model: str) -> Optional[Dict]:
         """Retrieve cached analysis"""
-        conn = self._get_connection()
-        cursor = conn.execute(
+        with self._pending_lock:
+            pending = self._pending.get((file_hash, model))
+        if pending:
+            return _json_loads(pending[0])
+        
+        # Readers don't need the write lock under WAL
+        cursor = self._conn.execute(
             "SELECT analysis FROM analysis_cache WHERE file_hash = ? AND model = ?",
-            (file_hash, model)
+            (sqlite3.Binary(file_hash), model)
         )
         row = cursor.fetchone()
         if row:
-            return json.loads(row[0])
+            return _json_loads(row[0])
         return None
     
-    def set(self, file_hash: str, model: str, analysis: Dict):
-        """Store analysis in cache"""
-        conn = self._get_connection()
-        conn.execute(
-            "INSERT OR REPLACE INTO analysis_cache (file_hash, model, analysis, timestamp) VALUES (?, ?, ?, ?)",
-            (file_hash, model, json.dumps(analysis), time.time())
-        )
-        conn.commit()
+    def get_many(self, file_hashes: List[bytes], model: str) -> Dict[bytes, Dict]:
+        """Retrieve cached analyses for many hashes with batched IN-queries"""
+        found: Dict[bytes, Dict] = {}
+        remaining = []
+        with self._pending_lock:
+            for file_hash in dict.fromkeys(file_hashes):
+                pending = self._pending.get((file_hash, model))
+                if pending:
+                    found[file_hash] = pending[0]
+                else:
+                    remaining.append(file_hash)
+        found = {file_hash: _json_loads(payload) for file_hash, payload in found.items()}
+        
+        for start in range(0, len(remaining), self.MAX_QUERY_HASHES):
+            chunk = remaining[start:start + self.MAX_QUERY_HASHES]
+            placeholders = ', '.join('?' * len(chunk))
+            cursor = self._conn.execute(
+                f"SELECT file_hash, analysis FROM analysis_cache WHERE model = ? AND file_hash IN ({placeholders})",
+                (model, *(sqlite3.Binary(file_hash) for file_hash in chunk))
+            )
+            for file_hash, payload in cursor:
+                found[bytes(file_hash)] = _json_loads(payload)
+        
+        return found
+    
+    def get_hash_by_stat(self, file_path: Path, stat: os.stat_result) -> Optional[bytes]:
+        """Return the remembered hash if the file is unchanged since it was hashed"""
+        key = (stat.st_dev, stat.st_ino)
+        with self._pending_lock:
+            row = self._pending_stats.get(key)
+        if row is None:
+            row = self._conn.execute(
+                "SELECT dev, inode, name, size, mtime, backend, file_hash FROM file_stat WHERE dev = ? AND inode = ?",
+                key
+            ).fetchone()
+        if row is None:
+            return None
+        
+        # The hash covers name, size and mtime, and differs per backend
+        _, _, name, size, mtime, backend, file_hash = row
+        if (name, size, mtime, backend) != (file_path.name, stat.st_size, stat.st_mtime, SmartHash.backend()):
+            return None
+        return bytes(file_hash)
+    
+    def remember_hash(self, file_path: Path, stat: os.stat_result, file_hash: bytes):
+        """Record a file's hash against its stat (buffered, see flush)"""
+        row = (stat.st_dev, stat.st_ino, file_path.name, stat.st_size, stat.st_mtime,
+               SmartHash.backend(), file_hash)
+        with self._pending_lock:
+            self._pending_stats[(stat.st_dev, stat.st_ino)] = row
+            should_flush = len(self._pending_stats) >= self.WRITE_BATCH_SIZE
+        if should_flush:
+            self.flush()
+    
+    def set(self, file_hash: bytes, model: str, analysis: Dict):
+        """Store analysis in cache (buffered, see flush)"""
+        payload = _json_dumps(analysis)
+        with self._pending_lock:
+            self._pending[(file_hash, model)] = (payload, time.time())
+            should_flush = len(self._pending) >= self.WRITE_BATCH_SIZE
+        if should_flush:
+            self.flush()
+    
+    def flush(self):
+        """Write all buffered entries in a single transaction"""
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+            pending_stats, self._pending_stats = self._pending_stats, {}
+        if not pending and not pending_stats:
+            return
+        
+        rows = [
+            (sqlite3.Binary(file_hash), model, sqlite3.Binary(payload), timestamp)
+            for (file_hash, model), (payload, timestamp) in pending.items()
+        ]
+        stat_rows = [row[:-1] + (sqlite3.Binary(row[-1]),) for row in pending_stats.values()]
+        with self._write_lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO analysis_cache (file_hash, model, analysis, timestamp) VALUES (?, ?, ?, ?)",
+                    rows
+                )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO file_stat (dev, inode, name, size, mtime, backend, file_hash) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    stat_rows
+                )
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
     
     def cleanup(self):
         """Remove entries older than TTL"""
-        conn = self._get_connection()
+        self.flush()
         cutoff = time.time() - (self.ttl_days * 86400)
-        conn.execute("DELETE FROM analysis_cache WHERE timestamp < ?", (cutoff,))
-        conn.commit()
+        
+        # Delete in bounded chunks via idx_timestamp so writers aren't stalled by one huge transaction
+        while True:
+            with self._write_lock:
+                cursor = self._conn.execute(
+                    """DELETE FROM analysis_cache WHERE rowid IN (
+                        SELECT rowid FROM analysis_cache WHERE timestamp < ? LIMIT ?
+                    )""",
+                    (cutoff, self.CLEANUP_BATCH_SIZE)
+                )
+            if cursor.rowcount < self.CLEANUP_BATCH_SIZE:
+                break
+        
+        # Drop stat shortcuts left behind by deleted files or expired analyses
+        with self._write_lock:
+            self._conn.execute(
+                "DELETE FROM file_stat WHERE file_hash NOT IN (SELECT file_hash FROM analysis_cache)"
+            )
     
     def close(self):
-        """Close database connection"""
-        if hasattr(self._local, 'conn'):
-            self._local.conn.close()
+        """Flush pending writes and close database connection"""
+        self.flush()
+        self._conn.close()
+
+
+# Analysis prompt; placeholders are {name}, {mime} and {cats}, literal braces are doubled
+_PROMPT_TEMPLATE = """Analyze this file and extract structured metadata.
+
+File: {name}
+Type: {mime}
+
+Please provide a JSON response with the following structure:
+{{
+    "title": "Brief descriptive title",
+    "description": "Detailed description of content",
+    "category": "One of: {cats}",
+    "tags": ["relevant", "tags", "here"],
+    "subject": "Main subject or topic",
+    "date": "YYYY-MM-DD if date is mentioned or visible",
+    "author": "Author/creator if identifiable",
+    "suggested_filename": "descriptive_filename_without_extension"
+}}
+
+Analyze the actual content, not just the filename. Be specific and accurate."""
 
 
 class AIAnalyzer:
     """Multimodal AI analyzer supporting Gemini and Ollama"""
     
-    def __init__(self, config: Config, cache: Optional[AnalysisCache] = None):
+    # Size of the raw content preview sent with text-based prompts
+    PREVIEW_BYTES = 10000
+    
+    def __init__(self, config: Config, cache: Optional[AnalysisCache] = None,
+                 rate_limiter: Optional[TokenBucket] = None):
         self.config = config
         self.cache = cache
+        self._categories = ', '.join(config.allowed_categories)
+        self._prompt_template = _PROMPT_TEMPLATE
+        # A shared limiter lets several analyzers honour one rate_limit_delay together
+        if rate_limiter is None and config.rate_limit_delay > 0:
+            rate_limiter = TokenBucket(1.0 / config.rate_limit_delay)
+        self._rate_limiter = rate_limiter
         
         # Initialize AI backend
         if not config.use_local and genai and config.gemini_api_key:
@@ -240,31 +655,42 @@ class AIAnalyzer:
             self.model_name = config.ollama_model
         else:
             raise RuntimeError("No AI backend available. Install google-generativeai or ollama.")
+        
+        # Backend handles reused for every file
+        self._gemini_model = genai.GenerativeModel(self.model_name) if self.backend == "gemini" else None
+        self._ollama_supports_vision: Optional[bool] = None
+        self._mime_cache: Dict[str, str] = {}
+    
+    def _guess_mime_type(self, file_path: Path) -> str:
+        """Guess the MIME type, memoized per trailing suffixes"""
+        # guess_type only looks at the last suffix, plus the one before it when the last is an
+        # encoding (.tar.gz vs .gz); keying on exactly that keeps the cache bounded by extensions
+        suffixes = file_path.suffixes[-2:]
+        if len(suffixes) == 2 and suffixes[-1].lower() not in mimetypes.encodings_map:
+            suffixes = suffixes[-1:]
+        key = ''.join(suffixes)
+        mime_type = self._mime_cache.get(key)
+        if mime_type is None:
+            mime_type, _ = mimetypes.guess_type(file_path.name)
+            mime_type = mime_type or 'application/octet-stream'
+            self._mime_cache[key] = mime_type
+        return mime_type
     
     def _prepare_prompt(self, file_path: Path, mime_type: str) -> str:
         """Prepare analysis prompt"""
-        return f"""Analyze this file and extract structured metadata.
-
-File: {file_path.name}
-Type: {mime_type}
-
-Please provide a JSON response with the following structure:
-{{
-    "title": "Brief descriptive title",
-    "description": "Detailed description of content",
-    "category": "One of: {', '.join(self.config.allowed_categories)}",
-    "tags": ["relevant", "tags", "here"],
-    "subject": "Main subject or topic",
-    "date": "YYYY-MM-DD if date is mentioned or visible",
-    "author": "Author/creator if identifiable",
-    "suggested_filename": "descriptive_filename_without_extension"
-}}
-
-Analyze the actual content, not just the filename. Be specific and accurate."""
+        return self._prompt_template.format(name=file_path.name, mime=mime_type, cats=self._categories)
+    
+    @staticmethod
+    def _read_preview(file_path: Path) -> str:
+        """Read a bounded byte preview of the file as text"""
+        # One raw read of exactly PREVIEW_BYTES, no text-mode decoder layer
+        with open(file_path, 'rb') as f:
+            data = f.read(AIAnalyzer.PREVIEW_BYTES)
+        return data.decode('utf-8', errors='ignore')
     
     def _analyze_with_gemini(self, file_path: Path, mime_type: str) -> Dict:
         """Analyze file using Google Gemini"""
-        model = genai.GenerativeModel(self.model_name)
+        model = self._gemini_model
         
         prompt = self._prepare_prompt(file_path, mime_type)
         
@@ -285,8 +711,7 @@ Analyze the actual content, not just the filename. Be specific and accurate."""
         else:
             # Text-based analysis
             try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read(10000)  # First 10KB
+                content = self._read_preview(file_path)
                 response = model.generate_content(f"{prompt}\n\nContent preview:\n{content}")
             except:
                 response = model.generate_content(prompt)
@@ -301,15 +726,18 @@ Analyze the actual content, not just the filename. Be specific and accurate."""
         
         return json.loads(text)
     
+    def _ollama_vision_supported(self) -> bool:
+        """Check once whether the Ollama model supports vision"""
+        if self._ollama_supports_vision is None:
+            model_info = ollama.show(self.model_name)
+            self._ollama_supports_vision = 'vision' in str(model_info).lower()
+        return self._ollama_supports_vision
+    
     def _analyze_with_ollama(self, file_path: Path, mime_type: str) -> Dict:
         """Analyze file using Ollama"""
         prompt = self._prepare_prompt(file_path, mime_type)
         
-        # Check if model supports vision
-        model_info = ollama.show(self.model_name)
-        supports_vision = 'vision' in str(model_info).lower()
-        
-        if mime_type.startswith('image/') and supports_vision:
+        if mime_type.startswith('image/') and self._ollama_vision_supported():
             # Vision model analysis
             with open(file_path, 'rb') as f:
                 import base64
@@ -324,8 +752,7 @@ Analyze the actual content, not just the filename. Be specific and accurate."""
         else:
             # Text-based analysis
             try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read(10000)
+                content = self._read_preview(file_path)
                 full_prompt = f"{prompt}\n\nContent preview:\n{content}"
             except:
                 full_prompt = prompt
@@ -338,10 +765,11 @@ Analyze the actual content, not just the filename. Be specific and accurate."""
         
         return json.loads(response['response'])
     
-    def analyze(self, file_path: Path) -> Dict:
+    def analyze(self, file_path: Path, file_hash: Optional[bytes] = None) -> Dict:
         """Analyze file and return structured metadata"""
-        # Calculate file hash
-        file_hash = SmartHash.calculate(file_path)
+        # Calculate file hash unless the caller already did
+        if file_hash is None:
+            file_hash = SmartHash.calculate(file_path, cache=self.cache)
         
         # Check cache
         if self.cache:
@@ -351,9 +779,10 @@ Analyze the actual content, not just the filename. Be specific and accurate."""
                 return cached
         
         # Detect MIME type
-        mime_type, _ = mimetypes.guess_type(file_path)
-        if not mime_type:
-            mime_type = 'application/octet-stream'
+        mime_type = self._guess_mime_type(file_path)
+        
+        if self._rate_limiter:
+            self._rate_limiter.acquire()
         
         print(f"  🤖 Analyzing with {self.backend}...")
         
@@ -366,7 +795,7 @@ Analyze the actual content, not just the filename. Be specific and accurate."""
             
             # Add metadata
             result['mime_type'] = mime_type
-            result['file_hash'] = file_hash
+            result['file_hash'] = file_hash.hex()
             result['analyzed_at'] = datetime.now().isoformat()
             result['model'] = self.model_name
             
@@ -385,7 +814,7 @@ Analyze the actual content, not just the filename. Be specific and accurate."""
                 'category': 'other',
                 'tags': [],
                 'mime_type': mime_type,
-                'file_hash': file_hash,
+                'file_hash': file_hash.hex(),
                 'analyzed_at': datetime.now().isoformat(),
                 'model': self.model_name,
                 'error': str(e)
@@ -395,66 +824,174 @@ Analyze the actual content, not just the filename. Be specific and accurate."""
 class MetadataManager:
     """Manage file metadata embedding and extraction"""
     
+    # Matches exiftool's per-command summary, e.g. "    1 image files updated"
+    _UPDATED_RE = re.compile(rb'^\s*[1-9]\d* image files updated', re.MULTILINE)
+    
+    def __init__(self):
+        self._exiftool: Optional[subprocess.Popen] = None
+        self._exiftool_missing = False
+        self._lock = threading.Lock()
+    
+    def _get_exiftool(self) -> Optional[subprocess.Popen]:
+        """Start (once) a persistent exiftool process reading commands from stdin"""
+        if self._exiftool is None and not self._exiftool_missing:
+            if not shutil.which('exiftool'):
+                self._exiftool_missing = True
+                return None
+            self._exiftool = subprocess.Popen(
+                ['exiftool', '-stay_open', 'True', '-@', '-'],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT
+            )
+        return self._exiftool
+    
+    @staticmethod
+    def _build_args(file_path: Path, metadata: Dict) -> List[str]:
+        """Build one exiftool command; the argfile protocol is one argument per line"""
+        args = ['-overwrite_original']
+        if os.name == 'nt':
+            args.extend(['-charset', 'filename=utf8'])
+        
+        if 'title' in metadata:
+            args.append(f'-Title={metadata["title"]}')
+        if 'description' in metadata:
+            args.append(f'-Description={metadata["description"]}')
+        if 'tags' in metadata and metadata['tags']:
+            tags_str = ', '.join(metadata['tags'])
+            args.append(f'-Keywords={tags_str}')
+        if 'author' in metadata:
+            args.append(f'-Author={metadata["author"]}')
+        if 'subject' in metadata:
+            args.append(f'-Subject={metadata["subject"]}')
+        
+        args.append(str(file_path))
+        # Newlines would split an argument in two
+        return [re.sub(r'[\r\n]+', ' ', arg) for arg in args]
+    
+    def _discard_exiftool(self):
+        """Kill and reap a dead exiftool so the next command starts a fresh one"""
+        exiftool, self._exiftool = self._exiftool, None
+        if exiftool is None:
+            return
+        exiftool.kill()
+        for stream in (exiftool.stdin, exiftool.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+        exiftool.wait()
+    
     @staticmethod
-    def embed_metadata(file_path: Path, metadata: Dict) -> bool:
+    def _execute(exiftool: subprocess.Popen, command: bytes) -> bytes:
+        """Run one command on the persistent exiftool and return its output"""
+        if exiftool.poll() is not None:
+            raise OSError("exiftool exited unexpectedly")
+        exiftool.stdin.write(command)
+        exiftool.stdin.flush()
+        
+        # Output for this command ends with a {ready} line
+        output = []
+        while True:
+            line = exiftool.stdout.readline()
+            if not line:
+                raise OSError("exiftool exited unexpectedly")
+            if line.strip() == b'{ready}':
+                return b''.join(output)
+            output.append(line)
+    
+    def embed_metadata(self, file_path: Path, metadata: Dict) -> bool:
         """Embed metadata into file using exiftool (if available)"""
         try:
-            import subprocess
-            
-            # Check if exiftool is available
-            result = subprocess.run(['exiftool', '-ver'], capture_output=True)
-            if result.returncode != 0:
-                return False
-            
-            # Prepare exiftool arguments
-            args = ['exiftool', '-overwrite_original']
-            
-            if 'title' in metadata:
-                args.extend([f'-Title={metadata["title"]}'])
-            if 'description' in metadata:
-                args.extend([f'-Description={metadata["description"]}'])
-            if 'tags' in metadata and metadata['tags']:
-                tags_str = ', '.join(metadata['tags'])
-                args.extend([f'-Keywords={tags_str}'])
-            if 'author' in metadata:
-                args.extend([f'-Author={metadata["author"]}'])
-            if 'subject' in metadata:
-                args.extend([f'-Subject={metadata["subject"]}'])
-            
-            args.append(str(file_path))
+            command = ('\n'.join(self._build_args(file_path, metadata)) + '\n-execute\n').encode('utf-8')
+            with self._lock:
+                # If exiftool died (between or during commands), restart it and retry once
+                for attempt in range(2):
+                    exiftool = self._get_exiftool()
+                    if exiftool is None:
+                        return False
+                    try:
+                        output = self._execute(exiftool, command)
+                        break
+                    except OSError:
+                        self._discard_exiftool()
+                        if attempt:
+                            raise
             
-            result = subprocess.run(args, capture_output=True, text=True)
-            return result.returncode == 0
+            return bool(self._UPDATED_RE.search(output))
         
         except Exception as e:
             print(f"  ⚠ Metadata embedding failed: {e}")
             return False
     
+    def close(self):
+        """Stop the persistent exiftool process"""
+        with self._lock:
+            exiftool, self._exiftool = self._exiftool, None
+        if exiftool is None:
+            return
+        try:
+            exiftool.stdin.write(b'-stay_open\nFalse\n')
+            exiftool.stdin.flush()
+            exiftool.wait(timeout=5)
+        except Exception:
+            exiftool.kill()
+    
     @staticmethod
     def create_json_sidecar(file_path: Path, metadata: Dict):
         """Create JSON sidecar file with metadata"""
         sidecar_path = file_path.with_suffix(file_path.suffix + '.json')
-        with open(sidecar_path, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2, ensure_ascii=False)
+        with open(sidecar_path, 'wb') as f:
+            f.write(_json_dumps(metadata, indent=True))
         print(f"  ✓ Created sidecar: {sidecar_path.name}")
 
 
+# Characters not allowed in filenames on common filesystems, mapped to '_'
+_BAD_FILENAME_CHARS = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
+
+
 class FileOrganizer:
     """Main file organization orchestrator"""
     
-    def __init__(self, config: Config):
+    # Files hashed and looked up in the cache per pipeline step
+    HASH_CHUNK_SIZE = 256
+    
+    # Writer threads for rename/embed/sidecar (exiftool is serialized anyway)
+    WRITER_THREADS = 2
+    
+    def __init__(self, config: Config, rate_limiter: Optional[TokenBucket] = None):
         self.config = config
+        if rate_limiter is None and config.rate_limit_delay > 0:
+            rate_limiter = TokenBucket(1.0 / config.rate_limit_delay)
+        self._rate_limiter = rate_limiter
         self.cache = AnalysisCache(config.cache_path, config.cache_ttl_days) if config.cache_enabled else None
-        self.analyzer = AIAnalyzer(config, self.cache)
+        self.analyzer = AIAnalyzer(config, self.cache, rate_limiter)
+        self.metadata_manager = MetadataManager()
+        self._hash_pool = HashPool()
+        # Collision checks and renames must be atomic across writer threads
+        self._rename_lock = threading.Lock()
+        # Organizers made by with_backend() borrow these resources and must not close them
+        self._owns_resources = True
+    
+    def with_backend(self, use_local: bool) -> 'FileOrganizer':
+        """Organizer for another AI backend sharing this one's cache, exiftool, hash pool and rate limiter"""
+        organizer = copy.copy(self)
+        organizer.config = replace(self.config, use_local=use_local)
+        organizer.analyzer = AIAnalyzer(organizer.config, self.cache, self._rate_limiter)
+        organizer._owns_resources = False
+        return organizer
     
-    def safe_rename(self, file_path: Path, suggested_name: str) -> Optional[Path]:
-        """Safely rename file with collision detection"""
+    def safe_rename(self, file_path: Path, suggested_name: str,
+                    dry_run: Optional[bool] = None) -> Optional[Path]:
+        """Safely rename file with collision detection (dry_run defaults to the config's)"""
+        if dry_run is None:
+            dry_run = self.config.dry_run
+        
         if not suggested_name:
             return None
         
         # Sanitize filename
-        suggested_name = re.sub(r'[<>:"/\\|?*]', '_', suggested_name)
-        suggested_name = suggested_name.strip()
+        suggested_name = suggested_name.translate(_BAD_FILENAME_CHARS).strip()
         
         # Add original extension
         new_path = file_path.parent / f"{suggested_name}{file_path.suffix}"
@@ -468,7 +1005,7 @@ class FileOrganizer:
         if new_path == file_path:
             return None
         
-        if not self.config.dry_run:
+        if not dry_run:
             file_path.rename(new_path)
             print(f"  ✓ Renamed: {file_path.name} → {new_path.name}")
         else:
@@ -476,24 +1013,28 @@ class FileOrganizer:
         
         return new_path
     
-    def process_file(self, file_path: Path) -> Dict:
-        """Process a single file"""
-        print(f"\n📄 Processing: {file_path}")
-        
-        result = {
+    @staticmethod
+    def _new_result(file_path: Path) -> Dict:
+        """Result record for a file that hasn't been processed yet"""
+        return {
             'file': str(file_path),
             'success': False,
             'metadata': None,
             'renamed_to': None
         }
+    
+    def _apply_metadata(self, file_path: Path, metadata: Dict, result: Dict,
+                        config: Optional[Config] = None) -> Dict:
+        """
+        Apply analysis results: interactive review, rename, embedding and sidecar
+        The feature flags are taken from config, defaulting to the organizer's own.
+        """
+        config = config or self.config
+        result['metadata'] = metadata
         
         try:
-            # Analyze file
-            metadata = self.analyzer.analyze(file_path)
-            result['metadata'] = metadata
-            
             # Interactive mode
-            if self.config.interactive:
+            if config.interactive:
                 print(f"\n  Analysis results:")
                 print(f"  Title: {metadata.get('title', 'N/A')}")
                 print(f"  Category: {metadata.get('category', 'N/A')}")
@@ -506,19 +1047,20 @@ class FileOrganizer:
                     return result
             
             # Rename file
-            if self.config.rename_files and 'suggested_filename' in metadata:
-                new_path = self.safe_rename(file_path, metadata['suggested_filename'])
+            if config.rename_files and 'suggested_filename' in metadata:
+                with self._rename_lock:
+                    new_path = self.safe_rename(file_path, metadata['suggested_filename'], config.dry_run)
                 if new_path:
                     result['renamed_to'] = str(new_path)
                     file_path = new_path
             
             # Embed metadata
-            if self.config.embed_metadata and not self.config.dry_run:
-                if MetadataManager.embed_metadata(file_path, metadata):
+            if config.embed_metadata and not config.dry_run:
+                if self.metadata_manager.embed_metadata(file_path, metadata):
                     print(f"  ✓ Embedded metadata")
             
             # Create JSON sidecar
-            if self.config.create_json_sidecar and not self.config.dry_run:
+            if config.create_json_sidecar and not config.dry_run:
                 MetadataManager.create_json_sidecar(file_path, metadata)
             
             result['success'] = True
@@ -530,53 +1072,214 @@ class FileOrganizer:
         
         return result
     
-    def process_batch(self, paths: List[Path]) -> List[Dict]:
-        """Process multiple files concurrently"""
-        results = []
+    def process_file(self, file_path: Path, metadata: Optional[Dict] = None,
+                     file_hash: Optional[bytes] = None, config: Optional[Config] = None) -> Dict:
+        """
+        Process a single file, optionally with its hash or cached metadata precomputed
+        config overrides the rename/embed/sidecar/dry-run/interactive flags for this call.
+        """
+        print(f"\n📄 Processing: {file_path}")
+        result = self._new_result(file_path)
+        
+        try:
+            # Analyze file
+            if metadata is None:
+                metadata = self.analyzer.analyze(file_path, file_hash)
+            else:
+                print(f"  ✓ Using cached analysis")
+        except Exception as e:
+            print(f"  ✗ Error: {e}")
+            result['error'] = str(e)
+            return result
+        
+        return self._apply_metadata(file_path, metadata, result, config)
+    
+    def _prefetch_cached(self, paths: List[Path]) -> Tuple[Dict[Path, Dict], Dict[Path, bytes]]:
+        """Hash all paths, then resolve cache hits with one bulk lookup"""
+        hashes: Dict[Path, bytes] = {}
+        
+        # Unchanged files reuse their remembered hash; only the rest are read
+        to_hash: List[Tuple[Path, os.stat_result]] = []
+        for path in paths:
+            try:
+                stat = path.stat()
+            except OSError:
+                # Leave it to process_file to surface the error
+                continue
+            file_hash = self.cache.get_hash_by_stat(path, stat) if self.cache else None
+            if file_hash:
+                hashes[path] = file_hash
+            else:
+                to_hash.append((path, stat))
         
-        with ThreadPoolExecutor(max_workers=self.config.max_workers) as executor:
-            futures = {executor.submit(self.process_file, path): path for path in paths}
+        if to_hash:
+            chunksize = max(1, len(to_hash) // (4 * (os.cpu_count() or 1)))
+            try:
+                digests = list(self._hash_pool.get().map(_hash_path, to_hash, chunksize=chunksize))
+            except (BrokenProcessPool, OSError) as e:
+                # Process pools can be unavailable (sandboxes, frozen apps); hash on threads instead
+                print(f"⚠ Hash process pool unavailable, falling back to threads: {e}")
+                self._hash_pool.shutdown(wait=False)
+                with ThreadPoolExecutor(max_workers=self.config.max_workers) as executor:
+                    digests = list(executor.map(_hash_path, to_hash))
             
-            for future in as_completed(futures):
-                try:
-                    result = future.result()
-                    results.append(result)
-                    
-                    # Rate limiting
-                    if self.config.rate_limit_delay > 0:
-                        time.sleep(self.config.rate_limit_delay)
-                
-                except Exception as e:
-                    path = futures[future]
-                    print(f"✗ Failed to process {path}: {e}")
-                    results.append({
-                        'file': str(path),
-                        'success': False,
-                        'error': str(e)
-                    })
+            for (path, stat), file_hash in zip(to_hash, digests):
+                if file_hash is None:
+                    continue
+                hashes[path] = file_hash
+                if self.cache:
+                    self.cache.remember_hash(path, stat, file_hash)
+        
+        if not self.cache:
+            return {}, hashes
+        
+        cached = self.cache.get_many(list(hashes.values()), self.analyzer.model_name)
+        hits = {path: cached[file_hash] for path, file_hash in hashes.items() if file_hash in cached}
+        return hits, hashes
+    
+    def _hash_stage(self, paths: Iterable[Union[str, Path]], analyze_queue: queue.Queue, write_queue: queue.Queue):
+        """Pipeline stage A: hash in chunks, send cache hits straight to the writers"""
+        paths = iter(paths)
+        while True:
+            # Paths are consumed lazily and only lifted to Path objects here
+            chunk = [Path(path) for path in itertools.islice(paths, self.HASH_CHUNK_SIZE)]
+            if not chunk:
+                break
+            try:
+                hits, hashes = self._prefetch_cached(chunk)
+            except Exception as e:
+                # Let the analyzers hash (and report on) these files themselves
+                print(f"⚠ Batch hashing failed: {e}")
+                hits, hashes = {}, {}
+            
+            for path in chunk:
+                if path in hits:
+                    write_queue.put((path, hits[path], None, True))
+                else:
+                    analyze_queue.put((path, hashes.get(path)))
+    
+    def _analyze_stage(self, analyze_queue: queue.Queue, write_queue: queue.Queue):
+        """Pipeline stage B: run AI analysis for cache misses"""
+        while True:
+            item = analyze_queue.get()
+            if item is None:
+                return
+            
+            path, file_hash = item
+            # Nothing may escape: a dead stage thread would stall the bounded queues
+            try:
+                print(f"\n📄 Processing: {path}")
+                outcome = (path, self.analyzer.analyze(path, file_hash), None, False)
+            except Exception as e:
+                outcome = (path, None, e, False)
+            write_queue.put(outcome)
+    
+    def _write_stage(self, write_queue: queue.Queue, results: List[Dict], results_lock: threading.Lock,
+                     config: Config):
+        """Pipeline stage C: rename, embed metadata and write sidecars"""
+        while True:
+            item = write_queue.get()
+            if item is None:
+                return
+            
+            path, metadata, error, cached = item
+            # Nothing may escape: a dead stage thread would stall the bounded queues
+            try:
+                if cached:
+                    print(f"\n📄 Processing: {path}")
+                    print(f"  ✓ Using cached analysis")
+                result = self._new_result(path)
+                if error is not None:
+                    print(f"✗ Failed to process {path}: {error}")
+                    result['error'] = str(error)
+                else:
+                    result = self._apply_metadata(path, metadata, result, config)
+            except Exception as e:
+                result = {'file': str(path), 'success': False, 'error': str(e)}
+            
+            with results_lock:
+                results.append(result)
+    
+    def process_batch(self, paths: Iterable[Union[str, Path]], config: Optional[Config] = None) -> List[Dict]:
+        """
+        Process multiple files as a pipeline:
+        hashing (process pool) → AI analysis (max_workers threads) → file writes
+        Bounded queues between stages overlap CPU, network and disk work.
+        config overrides the rename/embed/sidecar/dry-run/interactive flags for this call.
+        """
+        config = config or self.config
+        results: List[Dict] = []
+        results_lock = threading.Lock()
+        depth = 2 * self.config.max_workers
+        analyze_queue: queue.Queue = queue.Queue(maxsize=depth)
+        write_queue: queue.Queue = queue.Queue(maxsize=depth)
+        
+        # Interactive review prompts must not interleave, so use a single writer
+        writer_count = 1 if config.interactive else self.WRITER_THREADS
+        
+        analyzers = [
+            threading.Thread(target=self._analyze_stage, args=(analyze_queue, write_queue), daemon=True)
+            for _ in range(self.config.max_workers)
+        ]
+        writers = [
+            threading.Thread(target=self._write_stage, args=(write_queue, results, results_lock, config),
+                             daemon=True)
+            for _ in range(writer_count)
+        ]
+        # Create the hash pool before any stage thread exists
+        self._hash_pool.get()
+        for thread in analyzers + writers:
+            thread.start()
+        
+        try:
+            self._hash_stage(paths, analyze_queue, write_queue)
+        finally:
+            # Drain the pipeline stage by stage
+            for _ in analyzers:
+                analyze_queue.put(None)
+            for thread in analyzers:
+                thread.join()
+            for _ in writers:
+                write_queue.put(None)
+            for thread in writers:
+                thread.join()
         
         return results
     
     def cleanup(self):
         """Cleanup resources"""
+        if not self._owns_resources:
+            return
+        self.metadata_manager.close()
+        self._hash_pool.shutdown()
         if self.cache:
             self.cache.cleanup()
             self.cache.close()
 
 
-def collect_files(path: Path, recursive: bool = False) -> List[Path]:
-    """Collect files to process"""
+def collect_files(path: Path, recursive: bool = False) -> Iterator[str]:
+    """Collect files to process, yielding path strings"""
     if path.is_file():
-        return [path]
-    
-    files = []
-    pattern = "**/*" if recursive else "*"
+        yield str(path)
+        return
     
-    for item in path.glob(pattern):
-        if item.is_file() and not item.name.startswith('.'):
-            files.append(item)
+    if not recursive:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if not entry.name.startswith('.') and entry.is_file():
+                    yield entry.path
+        return
     
-    return files
+    for root, dirs, names in os.walk(path):
+        # Prune hidden directories in place so os.walk skips them
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        for name in names:
+            if name.startswith('.'):
+                continue
+            # os.walk lists FIFOs, sockets, devices and broken symlinks too; keep regular files only
+            file_path = os.path.join(root, name)
+            if os.path.isfile(file_path):
+                yield file_path
 
 
 def create_parser() -> argparse.ArgumentParser:
@@ -669,7 +1372,7 @@ def main():
     
     # Collect files
     if args.batch:
-        files = collect_files(path, args.recursive)
+        files = list(collect_files(path, args.recursive))
         print(f"\n📁 Found {len(files)} files to process")
     else:
         if path.is_dir():
@@ -688,7 +1391,7 @@ def main():
         start_time = time.time()
         
         if len(files) == 1:
-            results = [organizer.process_file(files[0])]
+            results = [organizer.process_file(Path(files[0]))]
         else:
             results = organizer.process_batch(files)
         
@@ -708,9 +1411,12 @@ def main():
         
         # Save results
         if not config.dry_run:
-            results_file = Path.cwd() / f"organizer_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            with open(results_file, 'w', encoding='utf-8') as f:
-                json.dump(results, f, indent=2, ensure_ascii=False)
+            # One JSON record per line, streamed so the whole run is never serialized at once
+            results_file = Path.cwd() / f"organizer_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+            with open(results_file, 'wb') as f:
+                for result in results:
+                    f.write(_json_dumps(result))
+                    f.write(b'\n')
             print(f"\n📊 Results saved to: {results_file}")
     
     finally:
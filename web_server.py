@@ -5,7 +5,12 @@ Flask web server for Smart File Organizer AI
 
 import os
 import json
+import atexit
+import shutil
+import threading
 from pathlib import Path
+from typing import Dict
+from dataclasses import replace
 from flask import Flask, request, jsonify, send_from_directory
 from werkzeug.utils import secure_filename
 from smart_file_organizer import Config, FileOrganizer, AnalysisCache, load_config
@@ -15,16 +20,76 @@ app.config['MAX_CONTENT_LENGTH'] = 100 * 1024 * 1024  # 100MB max file size
 app.config['UPLOAD_FOLDER'] = Path.home() / '.config' / 'smart-file-organizer' / 'uploads'
 app.config['UPLOAD_FOLDER'].mkdir(parents=True, exist_ok=True)
 
-ALLOWED_EXTENSIONS = {
+# Copy buffer for streaming uploads to disk
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+ALLOWED_EXTENSIONS = frozenset({
     'txt', 'pdf', 'png', 'jpg', 'jpeg', 'gif', 'webp', 'bmp',
     'mp3', 'wav', 'flac', 'm4a', 'ogg',
     'mp4', 'mov', 'avi', 'webm',
     'doc', 'docx', 'md', 'py', 'js', 'java', 'cpp'
-}
+})
+
+
+# Warm organizers shared across requests, at most one per AI backend (keyed on use_local).
+# The first one owns the cache, exiftool process, hash pool and rate limiter; the other
+# is derived from it with with_backend() so both share them.
+_ORGANIZERS: Dict[bool, FileOrganizer] = {}
+# Serializes organizer construction only; lookups of existing organizers don't take it
+_BUILD_LOCK = threading.Lock()
+
+
+def _get_organizer(use_local) -> FileOrganizer:
+    """Return the shared organizer for this backend, creating it on first use"""
+    # Coerce to bool so arbitrary JSON values can't mint new organizers (or be unhashable)
+    key = bool(use_local)
+    organizer = _ORGANIZERS.get(key)
+    if organizer is not None:
+        return organizer
+    
+    with _BUILD_LOCK:
+        # Double-checked: another request may have built it while we waited
+        organizer = _ORGANIZERS.get(key)
+        if organizer is not None:
+            return organizer
+        base = next(iter(_ORGANIZERS.values()), None)
+        if base is None:
+            config = load_config()
+            config.use_local = key
+            organizer = FileOrganizer(config)
+        else:
+            organizer = base.with_backend(key)
+        _ORGANIZERS[key] = organizer
+    
+    # Organizers live until exit, so expire old cache entries once, without holding the lock
+    if base is None and organizer.cache:
+        organizer.cache.cleanup()
+    return organizer
+
+
+def _request_options(organizer: FileOrganizer, data: Dict) -> Config:
+    """Per-request feature flags on top of the organizer's config"""
+    return replace(
+        organizer.config,
+        rename_files=bool(data.get('rename', False)),
+        embed_metadata=bool(data.get('embed_metadata', True)),
+        create_json_sidecar=bool(data.get('create_sidecar', True)),
+        dry_run=bool(data.get('dry_run', False))
+    )
+
+
+@atexit.register
+def _shutdown_organizers():
+    """Flush caches and stop helper processes on exit"""
+    with _BUILD_LOCK:
+        for organizer in _ORGANIZERS.values():
+            organizer.cleanup()
+        _ORGANIZERS.clear()
 
 
 def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    _, sep, ext = filename.rpartition('.')
+    return bool(sep) and ext.lower() in ALLOWED_EXTENSIONS
 
 
 @app.route('/')
@@ -46,7 +111,8 @@ def upload_files():
         if file and allowed_file(file.filename):
             filename = secure_filename(file.filename)
             filepath = app.config['UPLOAD_FOLDER'] / filename
-            file.save(filepath)
+            with open(filepath, 'wb') as dst:
+                shutil.copyfileobj(file.stream, dst, length=UPLOAD_CHUNK_SIZE)
             uploaded_files.append({
                 'name': filename,
                 'path': str(filepath),
@@ -61,31 +127,23 @@ def process_files():
     """Process uploaded files"""
     data = request.json
     
-    # Get configuration from request
-    config = load_config()
-    config.use_local = data.get('model') == 'ollama'
-    config.rename_files = data.get('rename', False)
-    config.embed_metadata = data.get('embed_metadata', True)
-    config.create_json_sidecar = data.get('create_sidecar', True)
-    config.dry_run = data.get('dry_run', False)
-    
     # Get file paths
     file_paths = [Path(f['path']) for f in data.get('files', [])]
     
     if not file_paths:
         return jsonify({'error': 'No files to process'}), 400
     
-    # Process files
-    organizer = FileOrganizer(config)
-    
     try:
-        results = []
-        for file_path in file_paths:
-            if file_path.exists():
-                result = organizer.process_file(file_path)
-                results.append(result)
+        # Reuse the warm organizer for this backend; the feature flags are per request
+        organizer = _get_organizer(data.get('model') == 'ollama')
+        
+        # Process files
+        results = organizer.process_batch([path for path in file_paths if path.exists()],
+                                          _request_options(organizer, data))
         
-        organizer.cleanup()
+        # Persist this request's analyses now rather than whenever the write buffer fills
+        if organizer.cache:
+            organizer.cache.flush()
         
         return jsonify({'results': results})
     